@@ -3,6 +3,7 @@ AgentRunner class for managing ADK agent execution with session management.
 """
 
 import logging
+import time
 from typing import Any, Optional
 import asyncio
 
@@ -11,6 +12,11 @@ from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory import InMemoryMemoryService
 from google.adk.sessions import InMemorySessionService, Session
 from google.genai import types
+from opentelemetry import trace
+
+from artifact_agent.router import PromptRouter, TIER_FAST, TIER_STRONG, is_infrastructure_error
+
+tracer = trace.get_tracer(__name__)
 
 
 class AgentRunner:
@@ -18,7 +24,7 @@ class AgentRunner:
     A reusable class for running ADK agents with session management.
     """
     
-    def __init__(self, agent, app_name: str, user_id: str = "default_user"):
+    def __init__(self, agent, app_name: str, user_id: str = "default_user", router: Optional[PromptRouter] = None):
         """
         Initialize the AgentRunner.
         
@@ -26,6 +32,7 @@ class AgentRunner:
             agent: The ADK agent to run
             app_name: Name of the application
             user_id: Default user ID (can be overridden per request)
+            router: Optional PromptRouter; when set, prompts run on its fast or strong tier agent instead
         """
         self.agent = agent
         self.app_name = app_name
@@ -38,6 +45,15 @@ class AgentRunner:
         self.runners = {}
         self.sessions = {}
         
+        # Tier runners share the session service, so a session can move between tiers
+        self.router = router
+        self.tier_runners = {}
+        if router is not None:
+            self.tier_runners = {
+                tier: Runner(agent=tier_agent, app_name=self.app_name, session_service=self.session_service)
+                for tier, tier_agent in router.agents.items()
+            }
+        
         # Setup logging
         self.logger = logging.getLogger(__name__)
     
@@ -112,34 +128,138 @@ class AgentRunner:
         
         self.logger.info(f"User Query: {prompt}")
         
-        try:
-            # Prepare the user's message in ADK format
-            content = types.Content(role='user', parts=[types.Part(text=prompt)])
-            
-            final_response_text = "Agent did not produce a final response."
+        # ADK records a span per model call and tool call under this span
+        with tracer.start_as_current_span("agent.run") as span:
+            span.set_attribute("agent.name", self.agent.name)
+            span.set_attribute("agent.user_id", user_id)
+            span.set_attribute("agent.session_id", session_id)
             
-            # Execute the agent and process events
-            async for event in runner.run_async(
-                user_id=user_id, 
-                session_id=session_id, 
-                new_message=content
-            ):
-                # Check for final response
-                if event.is_final_response():
-                    if event.content and event.content.parts:
-                        # Get text response from the first part
-                        final_response_text = event.content.parts[0].text
-                    elif event.actions and event.actions.escalate:
-                        # Handle potential errors/escalations
-                        final_response_text = f"Agent escalated: {event.error_message or 'No specific message.'}"
-                    break
+            try:
+                if self.router is None:
+                    final_response_text, _ = await self._run_events(runner, user_id, session_id, prompt, span)
+                else:
+                    final_response_text = await self._run_routed(user_id, session_id, prompt, span)
+                
+                self.logger.info(f"Agent Response: {final_response_text}")
+                return final_response_text
+                
+            except Exception as e:
+                span.record_exception(e)
+                span.set_status(trace.Status(trace.StatusCode.ERROR, str(e)))
+                self.logger.error(f"Error running agent for {user_id}: {e}")
+                return f"Sorry, I encountered an error: {str(e)}"
+    
+    async def _run_events(self, runner, user_id: str, session_id: str, prompt: str, span) -> tuple:
+        """
+        Send a prompt through a runner and collect the agent's final response.
+        
+        Returns:
+            tuple: (final response text, error of the first failed tool call or None)
+        """
+        # Prepare the user's message in ADK format
+        content = types.Content(role='user', parts=[types.Part(text=prompt)])
+        
+        final_response_text = "Agent did not produce a final response."
+        tool_error = None
+        
+        # Execute the agent and process events
+        async for event in runner.run_async(
+            user_id=user_id, 
+            session_id=session_id, 
+            new_message=content
+        ):
+            # Mark tool calls and responses on the agent span timeline
+            if event.get_function_calls():
+                span.add_event("tool_call", {"tools": [c.name for c in event.get_function_calls()]})
+            if event.get_function_responses():
+                span.add_event("tool_response", {"tools": [r.name for r in event.get_function_responses()]})
+                for function_response in event.get_function_responses():
+                    response = function_response.response or {}
+                    if response.get("success") is False and tool_error is None:
+                        tool_error = response.get("error") or "Tool call failed"
             
-            self.logger.info(f"Agent Response: {final_response_text}")
+            # Check for final response
+            if event.is_final_response():
+                if event.content and event.content.parts:
+                    # Get text response from the first part
+                    final_response_text = event.content.parts[0].text
+                elif event.actions and event.actions.escalate:
+                    # Handle potential errors/escalations
+                    final_response_text = f"Agent escalated: {event.error_message or 'No specific message.'}"
+                break
+        
+        return final_response_text, tool_error
+    
+    async def _run_routed(self, user_id: str, session_id: str, prompt: str, span) -> str:
+        """
+        Run a prompt on the tier picked by the router, falling back to the strong tier
+        if the fast tier's tool call fails.
+        
+        Failures from outages or exhausted Wolfram quota are not the model's doing:
+        they neither trigger a fallback nor mark the prompt as failed on the fast tier.
+        """
+        tier = self.router.classify(prompt)
+        span.set_attribute("agent.tier", tier)
+        
+        # History before this turn, to rewind to if the fast tier has to be retried
+        history = []
+        if tier == TIER_FAST:
+            session = await self.session_service.get_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            )
+            history = list(session.events)
+        
+        started = time.perf_counter()
+        try:
+            final_response_text, tool_error = await self._run_events(
+                self.tier_runners[tier], user_id, session_id, prompt, span
+            )
+        except Exception as e:
+            if tier != TIER_FAST:
+                raise
+            self.logger.warning(f"Fast tier failed for {user_id}: {e}")
+            final_response_text, tool_error = f"Sorry, I encountered an error: {str(e)}", str(e)
+        
+        if is_infrastructure_error(tool_error):
+            self.logger.warning(f"Render pipeline unavailable for {user_id}, not falling back: {tool_error}")
+            span.add_event("render_unavailable", {"error": tool_error})
+            self.router.record(prompt, tier, time.perf_counter() - started, success=False, remember=False)
             return final_response_text
+        
+        tool_failed = tool_error is not None
+        self.router.record(prompt, tier, time.perf_counter() - started, success=not tool_failed)
+        
+        if tier == TIER_FAST and tool_failed:
+            self.logger.info(f"Fast tier tool call failed, falling back to strong tier for {user_id}")
+            span.add_event("tier_fallback", {"from": TIER_FAST, "to": TIER_STRONG})
             
-        except Exception as e:
-            self.logger.error(f"Error running agent for {user_id}: {e}")
-            return f"Sorry, I encountered an error: {str(e)}"
+            # Drop the failed turn so the strong tier sees the prompt once, not the fast tier's attempt
+            await self._rewind_session(user_id, session_id, history)
+            
+            started = time.perf_counter()
+            final_response_text, tool_error = await self._run_events(
+                self.tier_runners[TIER_STRONG], user_id, session_id, prompt, span
+            )
+            self.router.record(
+                prompt, TIER_STRONG, time.perf_counter() - started, success=tool_error is None, fallback=True
+            )
+        
+        return final_response_text
+    
+    async def _rewind_session(self, user_id: str, session_id: str, events: list):
+        """
+        Recreate a session holding only the given events, discarding everything after them.
+        """
+        await self.session_service.delete_session(app_name=self.app_name, user_id=user_id, session_id=session_id)
+        session = await self.session_service.create_session(
+            app_name=self.app_name,
+            user_id=user_id,
+            session_id=session_id
+        )
+        for event in events:
+            await self.session_service.append_event(session, event)
+        
+        self.sessions[f"{user_id}_{session_id}"] = session
     
     async def get_session_info(self, user_id: str) -> dict:
         """
@@ -1,4 +1,4 @@
 
-from .agent import root_agent
+from .agent import root_agent, build_artifact_agent
 
-__all__ = ['root_agent']
\ No newline at end of file
+__all__ = ['root_agent', 'build_artifact_agent']
\ No newline at end of file
@@ -7,28 +7,47 @@ from google.adk.agents import Agent
 # Handle both relative and direct imports
 try:
     # Try relative import first (when used as module)
-    from .config import MODEL, WOLFRAM_INSTRUCTION, AGENT_DESCRIPTION
+    from .config import MODEL, FAST_MODEL, STRONG_MODEL, WOLFRAM_INSTRUCTION, AGENT_DESCRIPTION
     from .tools.wolfram_generator import generate_wolfram_artifact
 except ImportError:
     # Fallback to direct import (when run directly)
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-    from config import MODEL, WOLFRAM_INSTRUCTION, AGENT_DESCRIPTION
+    from config import MODEL, FAST_MODEL, STRONG_MODEL, WOLFRAM_INSTRUCTION, AGENT_DESCRIPTION
     from tools.wolfram_generator import generate_wolfram_artifact
 
 
+def build_artifact_agent(model=MODEL, name: str = "ArtifactAgent") -> Agent:
+    """
+    Build an ArtifactAgent around the given model.
+    
+    Args:
+        model: Model name or ADK BaseLlm instance (e.g. a scripted fake for benchmarks)
+        name: Agent name
+    
+    Returns:
+        Agent: Agent with the Wolfram instruction and artifact tool
+    """
+    return Agent(
+        name=name,
+        description=AGENT_DESCRIPTION,
+        model=model,
+        instruction=WOLFRAM_INSTRUCTION,
+        tools=[generate_wolfram_artifact]
+    )
+
+
 # Create the root agent (ArtifactAgent)
-agent_artifact = Agent(
-    name="ArtifactAgent",
-    description=AGENT_DESCRIPTION,
-    model=MODEL,
-    instruction=WOLFRAM_INSTRUCTION,
-    tools=[generate_wolfram_artifact]
-)
+agent_artifact = build_artifact_agent(MODEL)
 
 root_agent = agent_artifact
 
+# Model tiers used when complexity-based routing is enabled. They share the root
+# agent's name, so ADK reads a session's history as its own whichever tier wrote it
+fast_agent = build_artifact_agent(FAST_MODEL, name=root_agent.name)
+strong_agent = build_artifact_agent(STRONG_MODEL, name=root_agent.name)
+
 # Test imports when run directly
 if __name__ == "__main__":
     print("Testing agent.py imports...")
@@ -12,6 +12,13 @@ load_dotenv(os.path.join(parent_dir, '.env'))
 # Model configuration
 MODEL = os.getenv("MODEL", "gemini-2.0-flash-lite")
 
+# Model routing: simple prompts go to the fast tier, complex ones (and fast-tier failures) to the strong tier
+MODEL_ROUTING_ENABLED = os.getenv("MODEL_ROUTING_ENABLED", "FALSE").upper() == "TRUE"
+FAST_MODEL = os.getenv("FAST_MODEL", MODEL)
+STRONG_MODEL = os.getenv("STRONG_MODEL", MODEL)
+ROUTER_MAX_FAST_WORDS = int(os.getenv("ROUTER_MAX_FAST_WORDS", "25"))
+ROUTER_PROMPT_CACHE_SIZE = int(os.getenv("ROUTER_PROMPT_CACHE_SIZE", "1000"))
+
 # Agent Description
 AGENT_DESCRIPTION = "An intelligent agent that generates visual artifacts (images, plots, animations, mathematical visualizations) using Wolfram Language through a cloud service. Takes user prompts and creates custom artifacts by converting natural language into Wolfram expressions and generating visual outputs."
 
@@ -0,0 +1,178 @@
+"""
+Complexity-based routing between a fast and a strong ArtifactAgent tier.
+"""
+
+import re
+from collections import OrderedDict, deque
+from typing import Dict, Optional
+
+TIER_FAST = "fast"
+TIER_STRONG = "strong"
+
+# Words that usually mean a multi-part or harder-to-express visualization
+COMPLEX_KEYWORDS = (
+    "animate", "animation", "animated", "gif", "3d", "three-dimensional", "surface", "parametric",
+    "fractal", "compare", "side by side", "grid", "multiple", "several", "together", "overlay",
+    "combine", "legend", "label", "interactive", "manipulate", "sequence", "step by step",
+    "dataset", "network", "map", "tree", "diagram"
+)
+_COMPLEX_PATTERN = re.compile(r"\b(?:" + "|".join(re.escape(k) for k in COMPLEX_KEYWORDS) + r")s?\b")
+
+# Tool errors caused by the render pipeline rather than the model's expression
+INFRASTRUCTURE_ERRORS = (
+    "Network error", "Request timeout", "Wolfram quota exceeded", "CLOUD_RUN_SERVICE_URL not found"
+)
+
+
+def is_infrastructure_error(error: Optional[str]) -> bool:
+    """Whether a tool error comes from an outage or exhausted quota, which no model tier can fix."""
+    return bool(error) and error.startswith(INFRASTRUCTURE_ERRORS)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lower-case a prompt and collapse whitespace, so trivially different prompts share a cache entry."""
+    return " ".join(prompt.lower().split())
+
+
+class _TierStats:
+    """Latency and outcome counters for one tier."""
+
+    def __init__(self, window: int = 500):
+        self.requests = 0
+        self.failures = 0
+        self.total_latency = 0.0
+        self.latencies = deque(maxlen=window)
+
+    def record(self, latency: float, success: bool):
+        self.requests += 1
+        self.total_latency += latency
+        self.latencies.append(latency)
+        if not success:
+            self.failures += 1
+
+    def as_dict(self) -> Dict:
+        ordered = sorted(self.latencies)
+
+        def percentile(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 1)
+
+        return {
+            "requests": self.requests,
+            "tool_failures": self.failures,
+            "avg_latency_ms": round(self.total_latency / self.requests * 1000, 1) if self.requests else 0.0,
+            "p50_latency_ms": percentile(50),
+            "p95_latency_ms": percentile(95),
+        }
+
+
+class PromptRouter:
+    """
+    Sends each prompt to the fast or the strong tier using cheap local signals.
+
+    A prompt goes to the strong tier when it is long or mentions a complex
+    visualization. Prompts seen before are routed by how the fast tier did on
+    them last time, so a prompt the fast tier failed goes straight to the strong one.
+    """
+
+    def __init__(
+        self,
+        fast_agent,
+        strong_agent,
+        max_fast_words: int = 25,
+        prompt_cache_size: int = 1000
+    ):
+        """
+        Initialize the PromptRouter.
+
+        Args:
+            fast_agent: ADK agent for simple prompts
+            strong_agent: ADK agent for complex prompts and fallbacks
+            max_fast_words: Longest prompt, in words, still sent to the fast tier
+            prompt_cache_size: Number of recent prompts whose fast-tier outcome is remembered
+        """
+        self.agents = {TIER_FAST: fast_agent, TIER_STRONG: strong_agent}
+        self.max_fast_words = max_fast_words
+        self.prompt_cache_size = prompt_cache_size
+
+        # normalized prompt -> whether the fast tier's tool call succeeded
+        self.prompt_cache: "OrderedDict[str, bool]" = OrderedDict()
+        self.decisions: Dict[str, int] = {}
+        self.fallbacks = 0
+        self.stats = {TIER_FAST: _TierStats(), TIER_STRONG: _TierStats()}
+
+    def classify(self, prompt: str) -> str:
+        """
+        Pick a tier for a prompt.
+
+        Returns:
+            str: "fast" or "strong"
+        """
+        tier, reason = self._classify(normalize_prompt(prompt))
+        self.decisions[reason] = self.decisions.get(reason, 0) + 1
+        return tier
+
+    def _classify(self, prompt: str):
+        fast_succeeded = self.prompt_cache.get(prompt)
+        if fast_succeeded is not None:
+            self.prompt_cache.move_to_end(prompt)
+            return (TIER_FAST, "cache_hit") if fast_succeeded else (TIER_STRONG, "cache_failed")
+
+        if len(prompt.split()) > self.max_fast_words:
+            return TIER_STRONG, "length"
+
+        if _COMPLEX_PATTERN.search(prompt):
+            return TIER_STRONG, "keyword"
+
+        return TIER_FAST, "simple"
+
+    def record(
+        self,
+        prompt: str,
+        tier: str,
+        latency: float,
+        success: bool,
+        fallback: bool = False,
+        remember: bool = True
+    ):
+        """
+        Record the outcome of running a prompt on a tier.
+
+        Args:
+            prompt: The user's prompt
+            tier: Tier the prompt ran on
+            latency: Seconds the tier took
+            success: False if the tier's tool call failed
+            fallback: True if this run was a fallback from the fast tier
+            remember: False if the outcome says nothing about the tier (e.g. an outage)
+        """
+        self.stats[tier].record(latency, success)
+        if fallback:
+            self.fallbacks += 1
+
+        if tier == TIER_FAST and remember:
+            key = normalize_prompt(prompt)
+            self.prompt_cache[key] = success
+            self.prompt_cache.move_to_end(key)
+            while len(self.prompt_cache) > self.prompt_cache_size:
+                self.prompt_cache.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        """Per-tier latency, fallback rate and routing decisions."""
+        fast_requests = self.stats[TIER_FAST].requests
+        return {
+            "tiers": {
+                tier: {"agent": self.agents[tier].name, "model": _model_name(self.agents[tier]), **stats.as_dict()}
+                for tier, stats in self.stats.items()
+            },
+            "fallbacks": self.fallbacks,
+            "fallback_rate": round(self.fallbacks / fast_requests, 4) if fast_requests else 0.0,
+            "decisions": dict(self.decisions),
+            "prompt_cache_size": len(self.prompt_cache),
+        }
+
+
+def _model_name(agent) -> str:
+    """Model name of an agent whose model is a name or an ADK BaseLlm instance."""
+    return agent.model if isinstance(agent.model, str) else agent.model.model
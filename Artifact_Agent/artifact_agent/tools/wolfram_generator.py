@@ -3,12 +3,15 @@ import os
 from typing import Dict, Optional
 import logging
 from dotenv import load_dotenv
+from opentelemetry import trace
+from opentelemetry.propagate import inject
 
 # Load .env file from parent directory (two levels up from tools/)
 parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv(os.path.join(parent_dir, '.env'))
 
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 def generate_wolfram_artifact(
     expression: str, 
@@ -71,14 +74,24 @@ def generate_wolfram_artifact(
         # Make request to Cloud Run service
         logger.info(f"Calling Cloud Run service: {cloud_run_url}/generate")
         
-        response = requests.post(
-            f"{cloud_run_url}/generate",
-            json=payload,
-            timeout=60  # 60 second timeout for Wolfram processing
-        )
-        
-        response.raise_for_status()
-        result = response.json()
+        with tracer.start_as_current_span("POST /generate", kind=trace.SpanKind.CLIENT) as span:
+            span.set_attribute("artifact.id", artifact_id)
+            span.set_attribute("artifact.format", format)
+            
+            # Forward trace context so the storage service joins this trace
+            headers = {}
+            inject(headers)
+            
+            response = requests.post(
+                f"{cloud_run_url}/generate",
+                json=payload,
+                headers=headers,
+                timeout=60  # 60 second timeout for Wolfram processing
+            )
+            span.set_attribute("http.status_code", response.status_code)
+            
+            response.raise_for_status()
+            result = response.json()
         
         logger.info(f"Cloud Run response: {result.get('success', False)}")
         
@@ -0,0 +1,3 @@
+"""
+Benchmark harness for the Artifact Agent pipeline.
+"""
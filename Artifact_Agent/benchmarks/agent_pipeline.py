@@ -0,0 +1,228 @@
+"""
+Benchmark the Artifact Agent pipeline without Gemini or Wolfram in the loop.
+
+The agent's model is replaced with a scripted fake and `generate_wolfram_artifact`
+is pointed at a local fake render service, so the numbers reflect the cost of
+`/chat`, `AgentRunner`, ADK event handling and tool dispatch plus the configured
+fake latencies.
+
+Usage (from the Artifact_Agent directory):
+    python -m benchmarks.agent_pipeline --requests 200 --concurrency 16 --sessions 32
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+import tracemalloc
+from typing import Dict, List
+
+import httpx
+
+from .fake_model import ScriptedLlm
+from .fake_render_service import FakeRenderService
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(percentile / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _summary_ms(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+        "p90_ms": round(_percentile(ordered, 90) * 1000, 2),
+        "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+    }
+
+
+def _artifact_generated(chat_response: Dict) -> bool:
+    """
+    Whether a /chat reply carries a successful tool result.
+
+    /chat reports "success" even when the agent failed, so judge by the final
+    response: the scripted model answers with the tool's JSON result.
+    """
+    try:
+        result = json.loads(chat_response.get("response") or "")
+    except ValueError:
+        return False
+    return isinstance(result, dict) and result.get("success") is True
+
+
+async def _monitor_loop_lag(lags: List[float], interval: float, stop: asyncio.Event):
+    """Record how late the event loop wakes a task that asked to sleep `interval`."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_benchmark(
+    requests: int,
+    concurrency: int,
+    sessions: int,
+    model_latency: float,
+    render_latency: float,
+    warmup: int = 5
+) -> Dict:
+    """
+    Drive `/chat` in-process and collect throughput, latency, memory and loop lag.
+
+    Args:
+        requests: Number of measured `/chat` requests
+        concurrency: Number of requests in flight at once
+        sessions: Number of distinct sessions the requests are spread over
+        model_latency: Seconds the fake model takes per model call
+        render_latency: Seconds the fake render service takes per `/generate`
+        warmup: Unmeasured requests sent first to import and initialize everything
+
+    Returns:
+        dict: Benchmark report
+    """
+    render_service = FakeRenderService(render_latency=render_latency).start()
+    os.environ["CLOUD_RUN_SERVICE_URL"] = render_service.url
+
+    # Imported late so the tool and app pick up the fake service URL
+    import fastapi_app
+    from agent_runner import AgentRunner
+    from artifact_agent.agent import build_artifact_agent
+
+    agent = build_artifact_agent(ScriptedLlm(latency=model_latency))
+    fastapi_app.agent_runner = AgentRunner(agent=agent, app_name="artifactAgentBenchmark", user_id="bench_user")
+
+    transport = httpx.ASGITransport(app=fastapi_app.app)
+    latencies: List[float] = []
+    errors = 0
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+
+        async def send(index: int, session_prefix: str) -> bool:
+            payload = {
+                "prompt": "Create a sine wave plot",
+                "user_id": "bench_user",
+                "session_id": f"{session_prefix}_{index % sessions}"
+            }
+            response = await client.post("/chat", json=payload)
+            return response.status_code == 200 and _artifact_generated(response.json())
+
+        for index in range(warmup):
+            await send(index, "warmup")
+
+        tracemalloc.start()
+        memory_before = tracemalloc.get_traced_memory()[0]
+
+        lags: List[float] = []
+        stop = asyncio.Event()
+        monitor = asyncio.create_task(_monitor_loop_lag(lags, 0.01, stop))
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for index in range(requests):
+            queue.put_nowait(index)
+
+        async def worker():
+            nonlocal errors
+            while True:
+                try:
+                    index = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                try:
+                    ok = await send(index, "bench_session")
+                except Exception:
+                    ok = False
+                latencies.append(time.perf_counter() - started)
+                if not ok:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await monitor
+        memory_after, memory_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    render_service.stop()
+
+    memory_growth = memory_after - memory_before
+    return {
+        "config": {
+            "requests": requests,
+            "concurrency": concurrency,
+            "sessions": sessions,
+            "model_latency_s": model_latency,
+            "render_latency_s": render_latency,
+        },
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency": _summary_ms(latencies),
+        "memory": {
+            "growth_kib": round(memory_growth / 1024, 1),
+            "growth_per_session_kib": round(memory_growth / 1024 / sessions, 1),
+            "peak_kib": round(memory_peak / 1024, 1),
+        },
+        "event_loop_lag": _summary_ms(lags),
+    }
+
+
+def _print_report(report: Dict):
+    config = report["config"]
+    print(f"Requests:      {config['requests']} ({report['errors']} errors) over {config['sessions']} sessions, "
+          f"concurrency {config['concurrency']}")
+    print(f"Fake latency:  model {config['model_latency_s']}s, render {config['render_latency_s']}s")
+    print(f"Throughput:    {report['throughput_rps']} req/s in {report['elapsed_s']}s")
+    latency = report["latency"]
+    print(f"Latency:       p50 {latency['p50_ms']}ms  p90 {latency['p90_ms']}ms  "
+          f"p99 {latency['p99_ms']}ms  max {latency['max_ms']}ms")
+    memory = report["memory"]
+    print(f"Memory:        +{memory['growth_kib']} KiB total, +{memory['growth_per_session_kib']} KiB/session, "
+          f"peak {memory['peak_kib']} KiB")
+    lag = report["event_loop_lag"]
+    print(f"Loop lag:      p50 {lag['p50_ms']}ms  p99 {lag['p99_ms']}ms  max {lag['max_ms']}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Artifact Agent pipeline with a fake model")
+    parser.add_argument("--requests", type=int, default=200, help="Number of measured /chat requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once")
+    parser.add_argument("--sessions", type=int, default=16, help="Distinct sessions to spread requests over")
+    parser.add_argument("--model-latency", type=float, default=0.05, help="Seconds per fake model call")
+    parser.add_argument("--render-latency", type=float, default=0.1, help="Seconds per fake /generate call")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured warm-up requests")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--log-level", default="WARNING", help="Log level while the benchmark runs")
+    args = parser.parse_args()
+
+    # The app configures INFO logging on import; per-request logs would dominate the run
+    import fastapi_app  # noqa: F401
+    logging.getLogger().setLevel(args.log_level)
+
+    report = asyncio.run(run_benchmark(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        sessions=args.sessions,
+        model_latency=args.model_latency,
+        render_latency=args.render_latency,
+        warmup=args.warmup
+    ))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
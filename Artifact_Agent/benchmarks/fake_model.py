@@ -0,0 +1,70 @@
+"""
+Scripted stand-in for the Gemini model, used to benchmark the agent pipeline.
+"""
+
+import asyncio
+import json
+import uuid
+from typing import AsyncGenerator
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+
+class ScriptedLlm(BaseLlm):
+    """
+    Deterministic fake model that plays one Artifact Agent turn.
+
+    The first call of a turn answers with a `generate_wolfram_artifact` tool call;
+    once the tool response is in the request it answers with that response as JSON,
+    the same final output the real agent is instructed to produce.
+    """
+
+    model: str = "scripted-fake"
+    latency: float = 0.0
+    expression: str = "Plot[Sin[x], {x, 0, 2*Pi}]"
+    format: str = "png"
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+        last_parts = llm_request.contents[-1].parts if llm_request.contents else []
+        function_responses = [part.function_response for part in last_parts or [] if part.function_response]
+
+        if function_responses:
+            # Second model call of the turn: return the tool result as the final answer
+            text = json.dumps(function_responses[0].response)
+            yield LlmResponse(
+                content=types.Content(role="model", parts=[types.Part(text=text)]),
+                usage_metadata=_usage(llm_request)
+            )
+            return
+
+        # First model call of the turn: ask for the artifact
+        function_call = types.FunctionCall(
+            name="generate_wolfram_artifact",
+            args={
+                "expression": self.expression,
+                "format": self.format,
+                "artifact_id": f"bench_{uuid.uuid4().hex[:8]}"
+            }
+        )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(function_call=function_call)]),
+            usage_metadata=_usage(llm_request)
+        )
+
+
+def _usage(llm_request: LlmRequest) -> types.GenerateContentResponseUsageMetadata:
+    """Nominal token counts so ADK's usage telemetry treats the fake like a real model."""
+    prompt_tokens = len(llm_request.contents or [])
+    return types.GenerateContentResponseUsageMetadata(
+        prompt_token_count=prompt_tokens,
+        candidates_token_count=1,
+        total_token_count=prompt_tokens + 1
+    )
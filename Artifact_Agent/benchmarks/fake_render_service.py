@@ -0,0 +1,86 @@
+"""
+Minimal stand-in for the Cloud Storage service's `/generate` endpoint.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _RenderHandler(BaseHTTPRequestHandler):
+    """Answers `/generate` with a successful WolframResponse after a fixed delay."""
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "healthy", "service": "fake-render-service"})
+        else:
+            self._send_json(404, {"detail": "Not Found"})
+
+    def do_POST(self):
+        if self.path != "/generate":
+            self._send_json(404, {"detail": "Not Found"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        time.sleep(self.server.render_latency)
+
+        gcs_path = f"artifacts/{request.get('artifact_id')}_fake.{request.get('format', 'png')}"
+        self._send_json(200, {
+            "success": True,
+            "artifact_id": request.get("artifact_id"),
+            "expression": request.get("expression"),
+            "format": request.get("format", "png"),
+            "image_url": f"https://storage.googleapis.com/fake-bucket/{gcs_path}",
+            "gcs_path": gcs_path,
+            "timestamp": datetime.utcnow().isoformat(),
+            "error": None
+        })
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+
+class FakeRenderService:
+    """
+    Threaded HTTP server on localhost that mimics the render service.
+    """
+
+    def __init__(self, render_latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize the FakeRenderService.
+
+        Args:
+            render_latency: Seconds each `/generate` call takes
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.server = ThreadingHTTPServer((host, port), _RenderHandler)
+        self.server.daemon_threads = True
+        self.server.render_latency = render_latency
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeRenderService":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -7,13 +7,18 @@ from typing import Optional
 import asyncio
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import uvicorn
+from opentelemetry import trace
+from opentelemetry.propagate import extract
 
 from agent_runner import AgentRunner
-from artifact_agent.agent import root_agent
+from tracing import setup_tracing, format_trace_id
+from artifact_agent.agent import root_agent, fast_agent, strong_agent
+from artifact_agent.config import MODEL_ROUTING_ENABLED, ROUTER_MAX_FAST_WORDS, ROUTER_PROMPT_CACHE_SIZE
+from artifact_agent.router import PromptRouter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +27,10 @@ logger = logging.getLogger(__name__)
 # Global agent runner instance
 agent_runner: Optional[AgentRunner] = None
 
+# Tracing; /chat starts the trace that follows the request into the storage service
+setup_tracing("artifact-agent")
+tracer = trace.get_tracer(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -30,10 +39,21 @@ async def lifespan(app: FastAPI):
     
     # Startup
     logger.info("Starting Agent API...")
+    router = None
+    if MODEL_ROUTING_ENABLED:
+        router = PromptRouter(
+            fast_agent=fast_agent,
+            strong_agent=strong_agent,
+            max_fast_words=ROUTER_MAX_FAST_WORDS,
+            prompt_cache_size=ROUTER_PROMPT_CACHE_SIZE
+        )
+        logger.info(f"Model routing enabled: fast={fast_agent.model}, strong={strong_agent.model}")
+    
     agent_runner = AgentRunner(
         agent=root_agent,
         app_name="artifactAgentAPI",
-        user_id="api_user"
+        user_id="api_user",
+        router=router
     )
     logger.info("Agent runner initialized successfully")
     
@@ -61,6 +81,20 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Record a server span per request, continuing any incoming trace context."""
+    with tracer.start_as_current_span(
+        f"{request.method} {request.url.path}",
+        context=extract(request.headers),
+        kind=trace.SpanKind.SERVER
+    ) as span:
+        response = await call_next(request)
+        span.set_attribute("http.status_code", response.status_code)
+        response.headers["X-Trace-Id"] = format_trace_id(span)
+        return response
+
+
 # Request/Response models
 class ChatRequest(BaseModel):
     prompt: str = Field(..., description="User's message/ask to the Artifact Agent")
@@ -73,6 +107,7 @@ class ChatResponse(BaseModel):
     user_id: str = Field(..., description="User identifier")
     session_id: str = Field(..., description="Session identifier")
     status: str = Field(default="success", description="Response status")
+    trace_id: Optional[str] = Field(default=None, description="Trace ID linking this request's spans across services")
 
 
 class ErrorResponse(BaseModel):
@@ -98,7 +133,8 @@ async def root():
         "endpoints": {
             "chat": "/chat",
             "health": "/health",
-            "sessions": "/sessions/{user_id}"
+            "sessions": "/sessions/{user_id}",
+            "router_stats": "/router/stats"
         }
     }
 
@@ -128,7 +164,8 @@ async def chat_with_artifact_agent(request: ChatRequest) -> ChatResponse:
         raise HTTPException(status_code=503, detail="Agent runner not initialized")
     
     try:
-        logger.info(f"Chat request from user {request.user_id}: {request.prompt}")
+        trace_id = format_trace_id(trace.get_current_span())
+        logger.info(f"Chat request from user {request.user_id} (trace {trace_id}): {request.prompt}")
         
         # Run the agent with user's prompt
         response = await agent_runner.run_agent(
@@ -147,7 +184,8 @@ async def chat_with_artifact_agent(request: ChatRequest) -> ChatResponse:
             response=response,
             user_id=request.user_id,
             session_id=session_id,
-            status="success"
+            status="success",
+            trace_id=trace_id
         )
         
     except Exception as e:
@@ -182,6 +220,22 @@ async def get_user_sessions(user_id: str) -> SessionInfo:
         )
 
 
+@app.get("/router/stats", summary="Model routing statistics")
+async def get_router_stats():
+    """
+    Per-tier latency, fallback rate and routing decisions when model routing is enabled.
+    """
+    global agent_runner
+    
+    if not agent_runner:
+        raise HTTPException(status_code=503, detail="Agent runner not initialized")
+    
+    if agent_runner.router is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **agent_runner.router.get_stats()}
+
+
 @app.delete("/sessions/{user_id}/{session_id}", summary="Delete a session")
 async def delete_session(user_id: str, session_id: str):
     """
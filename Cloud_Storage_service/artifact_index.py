@@ -0,0 +1,242 @@
+"""
+Embedded SQLite index of generated artifacts.
+
+Maps artifact_id to its stored object and render metadata so lookups and
+listings never have to scan the bucket. The index can be rebuilt from the
+metadata stored on each blob.
+"""
+
+import base64
+import hashlib
+import logging
+import sqlite3
+import threading
+from datetime import timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_PREFIX = "artifacts/"
+# Ids used by warm_cache.py; its renders are not user demand
+WARM_ARTIFACT_PREFIX = "warm_"
+# Render cache hits store a small alias object pointing an artifact_id at another artifact's object
+ALIAS_PREFIX = "aliases/"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    artifact_id TEXT PRIMARY KEY,
+    gcs_path TEXT NOT NULL,
+    expression TEXT,
+    expression_hash TEXT,
+    format TEXT,
+    size_bytes INTEGER,
+    render_ms REAL,
+    content_sha256 TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_created ON artifacts (created_at, artifact_id);
+CREATE INDEX IF NOT EXISTS idx_artifacts_expression ON artifacts (expression_hash, created_at);
+"""
+
+_COLUMNS = (
+    "artifact_id", "gcs_path", "expression", "expression_hash", "format",
+    "size_bytes", "render_ms", "content_sha256", "created_at"
+)
+
+# Newer objects replace older ones for the same artifact_id; older ones never win
+_UPSERT = f"""
+INSERT INTO artifacts ({", ".join(_COLUMNS)}) VALUES ({", ".join("?" for _ in _COLUMNS)})
+ON CONFLICT (artifact_id) DO UPDATE SET
+    {", ".join(f"{column} = excluded.{column}" for column in _COLUMNS[1:])}
+WHERE excluded.created_at >= artifacts.created_at
+"""
+
+
+def hash_expression(expression: str) -> str:
+    """SHA-256 of a Wolfram expression, ignoring surrounding whitespace."""
+    return hashlib.sha256(expression.strip().encode("utf-8")).hexdigest()
+
+
+def _encode_cursor(created_at: str, artifact_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at}|{artifact_id}".encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        created_at, artifact_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return created_at, artifact_id
+
+
+class ArtifactIndex:
+    """
+    Artifact metadata index backed by a local SQLite database.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the ArtifactIndex.
+
+        Args:
+            path: SQLite database file (":memory:" for a process-local index)
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+        self.rebuild_status = "idle"
+        self.rebuild_count = 0
+
+    def record(
+        self,
+        artifact_id: str,
+        gcs_path: str,
+        expression: Optional[str],
+        format: str,
+        size_bytes: int,
+        render_ms: Optional[float],
+        content_sha256: Optional[str],
+        created_at: str
+    ):
+        """Insert or update the entry for an artifact."""
+        row = (
+            artifact_id, gcs_path, expression, hash_expression(expression) if expression else None, format,
+            size_bytes, render_ms, content_sha256, created_at
+        )
+        with self._lock, self._conn:
+            self._conn.execute(_UPSERT, row)
+
+    def get(self, artifact_id: str) -> Optional[Dict]:
+        """Entry for an artifact_id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM artifacts WHERE artifact_id = ?", (artifact_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list(self, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Entries newest first, one page at a time.
+
+        Args:
+            limit: Maximum entries to return
+            cursor: `next_cursor` from the previous page (None for the first page)
+
+        Returns:
+            tuple: (entries, next_cursor), next_cursor is None on the last page
+        """
+        query = "SELECT * FROM artifacts"
+        params: tuple = ()
+        if cursor:
+            query += " WHERE (created_at, artifact_id) < (?, ?)"
+            params = _decode_cursor(cursor)
+        query += " ORDER BY created_at DESC, artifact_id DESC LIMIT ?"
+
+        with self._lock:
+            rows = self._conn.execute(query, params + (limit + 1,)).fetchall()
+
+        entries = [dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = entries[-1]
+            next_cursor = _encode_cursor(last["created_at"], last["artifact_id"])
+        return entries, next_cursor
+
+    def find_by_expression(self, expression_hash: str, limit: int = 50) -> List[Dict]:
+        """Entries rendered from the expression with the given hash, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM artifacts WHERE expression_hash = ? ORDER BY created_at DESC LIMIT ?",
+                (expression_hash, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def popular_expressions(self, limit: int = 50, since: Optional[str] = None) -> List[Dict]:
+        """
+        Most requested expressions, counting one request per indexed artifact.
+
+        Cache-warming artifacts are left out, so warmed expressions don't rank themselves up.
+
+        Args:
+            limit: Maximum expressions to return
+            since: Only count artifacts created at or after this ISO timestamp
+
+        Returns:
+            list: Dicts with expression, expression_hash, format and requests, most requested first
+        """
+        query = (
+            "SELECT expression, expression_hash, format, COUNT(*) AS requests FROM artifacts"
+            " WHERE expression IS NOT NULL AND artifact_id NOT LIKE ? ESCAPE '\\'"
+        )
+        params: tuple = (WARM_ARTIFACT_PREFIX.replace("_", "\\_") + "%",)
+        if since:
+            query += " AND created_at >= ?"
+            params += (since,)
+        query += " GROUP BY expression_hash, format ORDER BY requests DESC, MAX(created_at) DESC LIMIT ?"
+
+        with self._lock:
+            rows = self._conn.execute(query, params + (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+
+    def rebuild_from_bucket(self, storage_client, bucket_name: str):
+        """
+        Re-index every object under `artifacts/`, and every alias under `aliases/`, from blob metadata.
+
+        Safe to run while the service is serving: entries only move forward in time.
+        """
+        self.rebuild_status = "running"
+        self.rebuild_count = 0
+        try:
+            for blob in storage_client.list_blobs(bucket_name, prefix=ARTIFACT_PREFIX):
+                metadata = blob.metadata or {}
+                name = blob.name[len(ARTIFACT_PREFIX):]
+                artifact_id = metadata.get("artifact_id") or name.rsplit("_", 1)[0]
+                render_ms = metadata.get("render_ms")
+                created_at = blob.time_created.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+
+                self.record(
+                    artifact_id=artifact_id,
+                    gcs_path=blob.name,
+                    expression=metadata.get("expression"),
+                    format=name.rsplit(".", 1)[-1],
+                    size_bytes=blob.size,
+                    render_ms=float(render_ms) if render_ms else None,
+                    content_sha256=metadata.get("content_sha256"),
+                    created_at=created_at
+                )
+                self.rebuild_count += 1
+
+            for blob in storage_client.list_blobs(bucket_name, prefix=ALIAS_PREFIX):
+                metadata = blob.metadata or {}
+                target = metadata.get("target")
+                if not target:
+                    continue
+                size_bytes = metadata.get("size_bytes")
+                created_at = blob.time_created.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+
+                self.record(
+                    artifact_id=metadata.get("artifact_id") or blob.name[len(ALIAS_PREFIX):],
+                    gcs_path=target,
+                    expression=metadata.get("expression"),
+                    format=target.rsplit(".", 1)[-1],
+                    size_bytes=int(size_bytes) if size_bytes else None,
+                    render_ms=None,
+                    content_sha256=metadata.get("content_sha256"),
+                    created_at=created_at
+                )
+                self.rebuild_count += 1
+
+            self.rebuild_status = "done"
+            logger.info(f"Artifact index rebuilt from bucket: {self.rebuild_count} objects")
+
+        except Exception as e:
+            self.rebuild_status = "failed"
+            logger.error(f"Artifact index rebuild failed: {str(e)}")
@@ -0,0 +1,105 @@
+"""
+Small in-memory caches used by the storage service.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with hit/miss counters, optional expiry
+    and an optional byte budget.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        """
+        Initialize the LRUCache.
+
+        Args:
+            maxsize: Maximum number of entries kept before the oldest is evicted
+            ttl: Seconds an entry stays readable after it is put (None keeps it until evicted)
+            max_bytes: Maximum total size of the values, as measured by `sizeof`
+            sizeof: Size in bytes of a value; required with max_bytes
+        """
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("LRUCache max_bytes needs a sizeof function")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._items or self._expired(key):
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key][1]
+
+    def put(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (expires_at, value, size)
+            self.bytes += size
+            # A value larger than the whole budget evicts everything, itself included
+            while self._items and (
+                len(self._items) > self.maxsize
+                or (self.max_bytes is not None and self.bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self._items)))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value; not counted as a lookup."""
+        with self._lock:
+            if key not in self._items or self._expired(key):
+                return default
+            return self._remove(key)
+
+    def _remove(self, key: Hashable) -> Any:
+        """Remove an entry and return its value. Callers hold the lock."""
+        _, value, size = self._items.pop(key)
+        self.bytes -= size
+        return value
+
+    def _expired(self, key: Hashable) -> bool:
+        """Drop the entry if its ttl has passed. Callers hold the lock."""
+        expires_at = self._items[key][0]
+        if expires_at is None or time.monotonic() < expires_at:
+            return False
+        self._remove(key)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        stats = {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+        if self.max_bytes is not None:
+            stats["bytes"] = self.bytes
+            stats["max_bytes"] = self.max_bytes
+        return stats
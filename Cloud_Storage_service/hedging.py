@@ -0,0 +1,139 @@
+"""
+Hedged requests: send a second identical request when the first is slow.
+
+The hedge fires once the first attempt has run longer than a percentile of
+recent latency for the same key. Whichever attempt succeeds first wins and
+the other is cancelled. Hedges are capped as a share of all requests so a
+slow backend is never hit with double the traffic.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from latency import LatencyTracker
+
+T = TypeVar("T")
+
+
+class _HedgeStats:
+    """Hedge counters for one key."""
+
+    def __init__(self):
+        self.requests = 0
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+
+    def as_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "hedges_sent": self.hedges_sent,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": round(self.hedges_sent / self.requests, 4) if self.requests else 0.0,
+            "hedge_win_rate": round(self.hedge_wins / self.hedges_sent, 4) if self.hedges_sent else 0.0,
+        }
+
+
+class Hedger:
+    """
+    Runs an attempt and hedges it with a second one when it is slower than usual.
+    """
+
+    def __init__(
+        self,
+        latency: LatencyTracker,
+        percentile: float = 95,
+        max_hedge_ratio: float = 0.05,
+        min_samples: int = 20
+    ):
+        """
+        Initialize the Hedger.
+
+        Args:
+            latency: Tracker of recent per-key latencies that sets the hedge delay
+            percentile: Latency percentile after which a hedge is sent
+            max_hedge_ratio: Maximum hedges as a share of all requests
+            min_samples: Samples required for a key before it is ever hedged
+        """
+        self.latency = latency
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.stats: Dict[str, _HedgeStats] = defaultdict(_HedgeStats)
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there is too little history."""
+        if self.latency.count(key) < self.min_samples:
+            return None
+        return self.latency.percentile(key, self.percentile)
+
+    def _within_budget(self) -> bool:
+        requests = sum(stats.requests for stats in self.stats.values())
+        hedges = sum(stats.hedges_sent for stats in self.stats.values())
+        return requests > 0 and (hedges + 1) / requests <= self.max_hedge_ratio
+
+    async def run(
+        self,
+        key: str,
+        attempt: Callable[[bool], Awaitable[T]],
+        can_hedge: Callable[[], bool] = lambda: True
+    ) -> T:
+        """
+        Run `attempt(False)`, and `attempt(True)` as a hedge if the first is slow.
+
+        Args:
+            key: Latency key (e.g. the output format)
+            attempt: Coroutine factory; its argument says whether this is the hedge
+            can_hedge: Last-moment check, e.g. for spare quota, before sending a hedge
+
+        Returns:
+            The result of the first attempt to succeed. If both fail, the primary's error is raised.
+        """
+        stats = self.stats[key]
+        stats.requests += 1
+
+        primary = asyncio.ensure_future(attempt(False))
+        tasks = [primary]
+        try:
+            delay = self.hedge_delay(key)
+            if delay is None:
+                return await primary
+
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._within_budget() or not can_hedge():
+                return await primary
+
+            stats.hedges_sent += 1
+            hedge = asyncio.ensure_future(attempt(True))
+            tasks.append(hedge)
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            stats.hedge_wins += 1
+                        return task.result()
+
+            # Both attempts failed
+            return primary.result()
+        finally:
+            # Cancel the loser, or both attempts if the caller itself was cancelled
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def snapshot(self) -> Dict:
+        return {
+            "percentile": self.percentile,
+            "max_hedge_ratio": self.max_hedge_ratio,
+            "keys": {
+                key: {**stats.as_dict(), "hedge_delay_ms": _ms(self.hedge_delay(key))}
+                for key, stats in self.stats.items()
+            },
+        }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
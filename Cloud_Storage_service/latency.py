@@ -0,0 +1,53 @@
+"""
+Online latency tracking over a sliding window of recent samples.
+"""
+
+import math
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Optional
+
+
+class LatencyTracker:
+    """
+    Keeps the most recent latencies per key and answers percentile queries.
+    """
+
+    def __init__(self, window: int = 500):
+        """
+        Initialize the LatencyTracker.
+
+        Args:
+            window: Number of recent samples kept per key
+        """
+        self.window = window
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float):
+        with self._lock:
+            self._samples[key].append(seconds)
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            return len(self._samples[key]) if key in self._samples else 0
+
+    def percentile(self, key: str, percentile: float) -> Optional[float]:
+        """Nearest-rank percentile of the recent samples for a key, or None without samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        rank = max(1, math.ceil(percentile / 100 * len(samples)))
+        return samples[rank - 1]
+
+    def snapshot(self) -> Dict:
+        result = {}
+        for key in list(self._samples):
+            result[key] = {
+                "samples": self.count(key),
+                "p50_ms": round(self.percentile(key, 50) * 1000, 1),
+                "p95_ms": round(self.percentile(key, 95) * 1000, 1),
+                "p99_ms": round(self.percentile(key, 99) * 1000, 1),
+            }
+        return result
@@ -1,17 +1,36 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse, Response
 from pydantic import BaseModel
 from google.cloud import storage
 import requests
-import uuid
+import hashlib
 import os
-from datetime import datetime
+import re
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Optional
 import logging
 
+from opentelemetry import trace
+from opentelemetry.propagate import extract
+
+from tracing import setup_tracing, format_trace_id
+from cache import LRUCache
+from artifact_index import ArtifactIndex, hash_expression, ALIAS_PREFIX
+from latency import LatencyTracker
+from hedging import Hedger
+from quota import QuotaManager, QuotaTimeoutError, PRIORITIES, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Wolfram Cloud Storage Service", version="1.0.0")
+# Tracing; spans continue the trace context sent by the Artifact Agent
+setup_tracing("wolfram-cloud-storage")
+tracer = trace.get_tracer(__name__)
 
 # Wolfram API URLs from environment
 WOLFRAM_APIS = {
@@ -19,14 +38,97 @@ WOLFRAM_APIS = {
     "gif": os.getenv("WOLFRAM_GIF_API")
 }
 
+# Hedged Wolfram requests for interactive traffic, off unless enabled
+WOLFRAM_HEDGE_ENABLED = os.getenv("WOLFRAM_HEDGE_ENABLED", "false").lower() == "true"
+wolfram_latency = LatencyTracker(window=int(os.getenv("WOLFRAM_LATENCY_WINDOW", "500")))
+hedger = Hedger(
+    latency=wolfram_latency,
+    percentile=float(os.getenv("WOLFRAM_HEDGE_PERCENTILE", "95")),
+    max_hedge_ratio=float(os.getenv("WOLFRAM_HEDGE_MAX_RATIO", "0.05")),
+    min_samples=int(os.getenv("WOLFRAM_HEDGE_MIN_SAMPLES", "20"))
+)
+
 # Google Cloud Storage
 BUCKET_NAME = os.getenv("GCS_BUCKET_NAME", "hack4unity-artifacts")
 storage_client = storage.Client()
 
+# Object names are content-addressed, so uploaded blobs never change and can be cached forever
+BLOB_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# artifact_id -> (gcs_path, etag) for the cached redirect endpoint
+ARTIFACT_REDIRECT_MAX_AGE = int(os.getenv("ARTIFACT_REDIRECT_MAX_AGE", "86400"))
+artifact_locations = LRUCache(maxsize=int(os.getenv("ARTIFACT_CACHE_SIZE", "10000")))
+
+# Local artifact metadata index, written on every successful /generate
+artifact_index = ArtifactIndex(os.getenv("ARTIFACT_INDEX_PATH", "artifact_index.db"))
+ARTIFACT_INDEX_REBUILD_ON_STARTUP = os.getenv("ARTIFACT_INDEX_REBUILD_ON_STARTUP", "true").lower() == "true"
+MAX_PAGE_SIZE = 200
+
+# Render cache: (expression_hash, format) -> index entry of a stored render to reuse
+RENDER_CACHE_ENABLED = os.getenv("RENDER_CACHE_ENABLED", "false").lower() == "true"
+render_cache = LRUCache(maxsize=int(os.getenv("RENDER_CACHE_SIZE", "10000")))
+
+# Expressions that render differently on each call (randomness, clock, external data) are never reused
+NONDETERMINISTIC_SYMBOLS = re.compile(
+    r"(?<![\w$])(?:Random\w*|Now|Today|Tomorrow|Yesterday|DateString|DateList|DateObject|TimeObject|"
+    r"AbsoluteTime|SessionTime|UnixTime|CurrentDate|\$TimeZone|Import|URLRead|URLExecute|URLFetch|"
+    r"WolframAlpha|FinancialData|WeatherData)(?!\w)"
+)
+
+# Progressive rendering: preview size, and preview jobs awaiting their full render
+PREVIEW_IMAGE_SIZE = int(os.getenv("PREVIEW_IMAGE_SIZE", "240"))
+render_jobs = LRUCache(maxsize=int(os.getenv("RENDER_JOBS_SIZE", "1000")))
+
+# Time to first image (preview or full) vs time to full render, per format
+first_image_latency = LatencyTracker(window=int(os.getenv("WOLFRAM_LATENCY_WINDOW", "500")))
+full_render_latency = LatencyTracker(window=int(os.getenv("WOLFRAM_LATENCY_WINDOW", "500")))
+
+# Ephemeral renders kept briefly in memory so they can be promoted without re-rendering
+# Entries hold whole images, so the cache is also capped by total bytes to stay within instance memory
+ephemeral_renders = LRUCache(
+    maxsize=int(os.getenv("EPHEMERAL_CACHE_SIZE", "100")),
+    ttl=float(os.getenv("EPHEMERAL_CACHE_TTL", "300")),
+    max_bytes=int(os.getenv("EPHEMERAL_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    sizeof=lambda entry: len(entry[2])
+)
+
+CONTENT_TYPES = {"png": "image/png", "gif": "image/gif"}
+
+# Blob metadata is capped at 8 KiB, so very long expressions are left out of it
+MAX_METADATA_EXPRESSION_LENGTH = 4096
+
+# Wolfram API quota, one token bucket per endpoint shared by all priority classes
+quota_manager = QuotaManager(
+    endpoints=WOLFRAM_APIS.keys(),
+    rate=float(os.getenv("WOLFRAM_QUOTA_RATE", "1.0")),
+    capacity=float(os.getenv("WOLFRAM_QUOTA_BURST", "5")),
+    timeouts={
+        PRIORITY_INTERACTIVE: float(os.getenv("WOLFRAM_QUOTA_INTERACTIVE_TIMEOUT", "30")),
+        PRIORITY_BATCH: float(os.getenv("WOLFRAM_QUOTA_BATCH_TIMEOUT", "600"))
+    }
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Rebuild the artifact index in the background so startup never waits on the bucket"""
+    if ARTIFACT_INDEX_REBUILD_ON_STARTUP:
+        threading.Thread(
+            target=artifact_index.rebuild_from_bucket,
+            args=(storage_client, BUCKET_NAME),
+            name="artifact-index-rebuild",
+            daemon=True
+        ).start()
+    yield
+
+app = FastAPI(title="Wolfram Cloud Storage Service", version="1.0.0", lifespan=lifespan)
+
 class WolframRequest(BaseModel):
     expression: str
     format: str = "png"  # png or gif
     artifact_id: str
+    priority: str = PRIORITY_INTERACTIVE  # interactive or batch
+    preview: bool = False  # return a low-resolution still first, full render in the background
+    ephemeral: bool = False  # return the image bytes in the response without storing them
 
 class WolframResponse(BaseModel):
     success: bool
@@ -37,19 +139,475 @@ class WolframResponse(BaseModel):
     gcs_path: str = None
     timestamp: str
     error: str = None
+    cached: bool = False
+    preview_url: str = None
+    status: str = "complete"  # complete, rendering (preview ready, full render pending) or failed
+
+def public_url(gcs_path: str) -> str:
+    """Public storage.googleapis.com URL for an object in the artifacts bucket"""
+    return f"https://storage.googleapis.com/{BUCKET_NAME}/{gcs_path}"
+
+def call_wolfram(api_url: str, expression: str) -> bytes:
+    """Blocking Wolfram API call returning the rendered image bytes"""
+    response = requests.get(api_url, params={"expr": expression}, timeout=30)
+    response.raise_for_status()
+    return response.content
+
+async def render_with_wolfram(api_url: str, request: WolframRequest, latency_key: Optional[str] = None) -> bytes:
+    """
+    Render an expression off the event loop, hedging slow interactive renders when enabled.
+    
+    A hedge is only sent if a quota token is free right now; it never queues.
+    Latency is tracked under `latency_key`, the request format by default.
+    """
+    latency_key = latency_key or request.format
+    
+    def timed_call() -> bytes:
+        # Timed in the worker thread, so a call whose attempt lost to a hedge and was
+        # cancelled still records its full (slow) latency when it finally returns
+        started = time.perf_counter()
+        content = call_wolfram(api_url, request.expression)
+        wolfram_latency.record(latency_key, time.perf_counter() - started)
+        return content
+    
+    async def attempt(hedge: bool) -> bytes:
+        with tracer.start_as_current_span("wolfram.render", kind=trace.SpanKind.CLIENT) as span:
+            span.set_attribute("wolfram.hedge", hedge)
+            content = await run_in_threadpool(timed_call)
+            span.set_attribute("wolfram.response_bytes", len(content))
+        return content
+    
+    if not WOLFRAM_HEDGE_ENABLED or request.priority != PRIORITY_INTERACTIVE:
+        return await attempt(False)
+    
+    return await hedger.run(
+        latency_key,
+        attempt,
+        can_hedge=lambda: quota_manager.try_acquire(request.format, request.priority)
+    )
+
+def preview_expression(expression: str) -> str:
+    """
+    Wolfram expression for a fast low-resolution still of `expression`.
+    
+    An Animate is replaced by its first frame: the body evaluated at the start of
+    the first parameter's range.
+    """
+    return (
+        f"Rasterize[ReleaseHold[Hold[{expression}] /. "
+        f"HoldPattern[Animate[body_, {{var_Symbol, start_, ___}}, ___]] :> With[{{var = start}}, body]], "
+        f"ImageSize -> {PREVIEW_IMAGE_SIZE}]"
+    )
+
+def lookup_render(expression: str, format: str) -> Optional[dict]:
+    """Index entry of a stored render of the same expression and format, or None"""
+    if NONDETERMINISTIC_SYMBOLS.search(expression):
+        return None
+    
+    key = (hash_expression(expression), format)
+    entry = render_cache.get(key)
+    if entry is None:
+        for candidate in artifact_index.find_by_expression(key[0]):
+            if candidate["format"] == format and candidate["content_sha256"]:
+                entry = candidate
+                render_cache.put(key, entry)
+                break
+    return entry
+
+def find_artifact_object(artifact_id: str):
+    """
+    Find the newest stored object for an artifact_id with a prefix listing.
+    
+    Returns (gcs_path, etag), or None if the artifact has no object.
+    """
+    prefix = f"artifacts/{artifact_id}_"
+    newest = None
+    for blob in storage_client.list_blobs(BUCKET_NAME, prefix=prefix):
+        # Skip objects of other artifacts whose id merely starts with this one
+        if "_" in blob.name[len(prefix):]:
+            continue
+        if newest is None or blob.time_created > newest.time_created:
+            newest = blob
+    
+    if newest is None:
+        # Render cache hits point their artifact_id at another artifact's object
+        alias = storage_client.bucket(BUCKET_NAME).get_blob(f"{ALIAS_PREFIX}{artifact_id}")
+        if alias is None or not (alias.metadata or {}).get("target"):
+            return None
+        return alias.metadata["target"], alias.metadata.get("content_sha256") or alias.etag
+    etag = (newest.metadata or {}).get("content_sha256") or newest.etag
+    return newest.name, etag
+
+def write_alias(artifact_id: str, expression: str, entry: dict):
+    """
+    Store a small alias object pointing artifact_id at an existing render, so the id
+    still resolves after a restart, on other instances and after an index rebuild
+    """
+    metadata = {
+        "artifact_id": artifact_id,
+        "target": entry["gcs_path"],
+        "content_sha256": entry["content_sha256"],
+        "size_bytes": str(entry["size_bytes"] or "")
+    }
+    if len(expression) <= MAX_METADATA_EXPRESSION_LENGTH:
+        metadata["expression"] = expression
+    
+    with tracer.start_as_current_span("gcs.alias", kind=trace.SpanKind.CLIENT) as alias_span:
+        alias_span.set_attribute("gcs.object", f"{ALIAS_PREFIX}{artifact_id}")
+        blob = storage_client.bucket(BUCKET_NAME).blob(f"{ALIAS_PREFIX}{artifact_id}")
+        blob.metadata = metadata
+        blob.upload_from_string(entry["gcs_path"], content_type="text/plain")
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Record a server span per request, continuing any incoming trace context"""
+    with tracer.start_as_current_span(
+        f"{request.method} {request.url.path}",
+        context=extract(request.headers),
+        kind=trace.SpanKind.SERVER
+    ) as span:
+        response = await call_next(request)
+        span.set_attribute("http.status_code", response.status_code)
+        response.headers["X-Trace-Id"] = format_trace_id(span)
+        return response
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint for Cloud Run"""
-    return {"status": "healthy", "service": "wolfram-cloud-storage"}
+    return {
+        "status": "healthy",
+        "service": "wolfram-cloud-storage",
+        "artifact_index": artifact_index.rebuild_status
+    }
+
+@app.get("/metrics")
+async def metrics():
+    """Wolfram quota use and queue wait per priority class"""
+    return {
+        "service": "wolfram-cloud-storage",
+        "quota": quota_manager.snapshot(),
+        "wolfram_latency": wolfram_latency.snapshot(),
+        "hedging": {"enabled": WOLFRAM_HEDGE_ENABLED, **hedger.snapshot()},
+        "render_timings": {
+            "time_to_first_image": first_image_latency.snapshot(),
+            "full_render": full_render_latency.snapshot()
+        },
+        "artifact_cache": artifact_locations.stats(),
+        "render_cache": {"enabled": RENDER_CACHE_ENABLED, **render_cache.stats()},
+        "ephemeral_cache": ephemeral_renders.stats(),
+        "artifact_index": {
+            "entries": artifact_index.count(),
+            "rebuild_status": artifact_index.rebuild_status,
+            "rebuild_count": artifact_index.rebuild_count
+        }
+    }
+
+@app.get("/artifacts")
+async def list_artifacts(limit: int = 50, cursor: Optional[str] = None):
+    """
+    List indexed artifacts newest first; pass `next_cursor` back as `cursor` for the next page
+    """
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"Limit must be between 1 and {MAX_PAGE_SIZE}")
+    
+    try:
+        items, next_cursor = artifact_index.list(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"items": items, "next_cursor": next_cursor}
+
+@app.get("/artifacts/{artifact_id}/metadata")
+async def get_artifact_metadata(artifact_id: str):
+    """Indexed metadata for one artifact"""
+    entry = artifact_index.get(artifact_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Artifact not found: {artifact_id}")
+    return entry
+
+@app.get("/expressions/popular")
+async def popular_expressions(limit: int = 50, days: Optional[float] = None):
+    """Most requested expressions, optionally over the last `days` days"""
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"Limit must be between 1 and {MAX_PAGE_SIZE}")
+    since = (datetime.utcnow() - timedelta(days=days)).isoformat() if days else None
+    return {"items": artifact_index.popular_expressions(limit=limit, since=since)}
+
+@app.get("/expressions/{expression_hash}/artifacts")
+async def find_artifacts_by_expression(expression_hash: str, limit: int = 50):
+    """Artifacts rendered from an expression, by the SHA-256 of the stripped expression"""
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"Limit must be between 1 and {MAX_PAGE_SIZE}")
+    return {"items": artifact_index.find_by_expression(expression_hash, limit=limit)}
+
+@app.get("/artifacts/{artifact_id}")
+async def get_artifact(artifact_id: str, request: Request):
+    """
+    Redirect to an artifact's stored image with cacheable headers
+    """
+    location = artifact_locations.get(artifact_id)
+    if location is None:
+        entry = artifact_index.get(artifact_id)
+        if entry is not None:
+            location = (entry["gcs_path"], entry["content_sha256"] or entry["gcs_path"])
+        else:
+            location = await run_in_threadpool(find_artifact_object, artifact_id)
+        if location is None:
+            raise HTTPException(status_code=404, detail=f"Artifact not found: {artifact_id}")
+        artifact_locations.put(artifact_id, location)
+    
+    gcs_path, etag = location
+    headers = {
+        "Cache-Control": f"public, max-age={ARTIFACT_REDIRECT_MAX_AGE}",
+        "ETag": f'"{etag}"'
+    }
+    
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    
+    return RedirectResponse(public_url(gcs_path), status_code=302, headers=headers)
+
+@app.get("/generate/{artifact_id}/status", response_model=WolframResponse)
+async def get_render_status(artifact_id: str):
+    """
+    Poll a preview request: status is "rendering" until the full render is stored
+    """
+    job = render_jobs.get(artifact_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No preview render found for artifact: {artifact_id}")
+    return job
+
+async def wait_for_quota(endpoint: str, priority: str):
+    """Wait for Wolfram quota; batch requests queue behind interactive ones"""
+    with tracer.start_as_current_span("quota.acquire") as quota_span:
+        waited = await quota_manager.acquire(endpoint, priority)
+        quota_span.set_attribute("quota.wait_seconds", waited)
+    if waited >= 0.01:
+        logger.info(f"Waited {waited:.2f}s for {priority} {endpoint} quota")
+
+def upload_object(filename: str, content: bytes, content_type: str, metadata: dict):
+    """Upload bytes to Google Cloud Storage as a public, immutable object"""
+    logger.info(f"Uploading to GCS: {filename}")
+    with tracer.start_as_current_span("gcs.upload", kind=trace.SpanKind.CLIENT) as upload_span:
+        upload_span.set_attribute("gcs.object", filename)
+        bucket = storage_client.bucket(BUCKET_NAME)
+        blob = bucket.blob(filename)
+        blob.cache_control = BLOB_CACHE_CONTROL
+        blob.metadata = metadata
+        blob.upload_from_string(content, content_type=content_type)
+        
+        # Make blob publicly readable
+        blob.make_public()
+
+async def render(request: WolframRequest, api_url: str):
+    """
+    Render an expression with Wolfram once quota allows
+    
+    Returns:
+        tuple: (image bytes, render time in milliseconds)
+    """
+    await wait_for_quota(request.format, request.priority)
+    
+    # Call Wolfram API
+    logger.info(f"Calling Wolfram API: {api_url}")
+    render_started = time.perf_counter()
+    content = await render_with_wolfram(api_url, request)
+    return content, (time.perf_counter() - render_started) * 1000
+
+async def render_and_store(request: WolframRequest, api_url: str) -> WolframResponse:
+    """
+    Render an expression with Wolfram, upload it and index it
+    """
+    content, render_ms = await render(request, api_url)
+    # GCS and SQLite calls block; keep them off the event loop
+    return await run_in_threadpool(store_render, request, content, render_ms)
+
+def store_render(request: WolframRequest, content: bytes, render_ms: float) -> WolframResponse:
+    """
+    Upload rendered bytes as an artifact, index them and fill the render cache
+    """
+    # Content-addressed filename: same bytes, same name
+    timestamp = datetime.utcnow().isoformat()
+    content_sha256 = hashlib.sha256(content).hexdigest()
+    filename = f"artifacts/{request.artifact_id}_{content_sha256[:16]}.{request.format}"
+    
+    metadata = {
+        "artifact_id": request.artifact_id,
+        "content_sha256": content_sha256,
+        "render_ms": f"{render_ms:.1f}"
+    }
+    if len(request.expression) <= MAX_METADATA_EXPRESSION_LENGTH:
+        metadata["expression"] = request.expression
+    
+    upload_object(filename, content, CONTENT_TYPES[request.format], metadata)
+    
+    # Generate public URL
+    image_url = public_url(filename)
+    artifact_locations.put(request.artifact_id, (filename, content_sha256))
+    artifact_index.record(
+        artifact_id=request.artifact_id,
+        gcs_path=filename,
+        expression=request.expression,
+        format=request.format,
+        size_bytes=len(content),
+        render_ms=render_ms,
+        content_sha256=content_sha256,
+        created_at=timestamp
+    )
+    render_cache.put((hash_expression(request.expression), request.format), artifact_index.get(request.artifact_id))
+    
+    logger.info(f"Successfully generated artifact: {image_url}")
+    
+    return WolframResponse(
+        success=True,
+        artifact_id=request.artifact_id,
+        expression=request.expression,
+        format=request.format,
+        image_url=image_url,
+        gcs_path=filename,
+        timestamp=timestamp
+    )
+
+async def start_progressive_render(
+    request: WolframRequest,
+    api_url: str,
+    started: float,
+    background_tasks: BackgroundTasks
+) -> Optional[WolframResponse]:
+    """
+    Render and store a low-resolution still right away; the full render runs in the background.
+    
+    Returns None if the preview fails, so the caller can render in full instead.
+    """
+    preview_request = request.model_copy(
+        update={"expression": preview_expression(request.expression), "format": "png"}
+    )
+    
+    try:
+        await wait_for_quota("png", request.priority)
+        logger.info(f"Rendering preview for artifact {request.artifact_id}")
+        with tracer.start_as_current_span("wolfram.preview"):
+            content = await render_with_wolfram(WOLFRAM_APIS["png"], preview_request, latency_key="png_preview")
+        
+        content_sha256 = hashlib.sha256(content).hexdigest()
+        filename = f"previews/{request.artifact_id}_{content_sha256[:16]}.png"
+        await run_in_threadpool(upload_object, filename, content, "image/png", {
+            "artifact_id": request.artifact_id,
+            "content_sha256": content_sha256
+        })
+    except Exception as e:
+        # A preview only speeds things up; its failure must not fail the request
+        logger.warning(f"Preview failed for artifact {request.artifact_id}, rendering in full: {str(e)}")
+        trace.get_current_span().add_event("preview_failed", {"error": str(e)})
+        return None
+    
+    first_image_latency.record(request.format, time.perf_counter() - started)
+    
+    response = WolframResponse(
+        success=True,
+        artifact_id=request.artifact_id,
+        expression=request.expression,
+        format=request.format,
+        preview_url=public_url(filename),
+        timestamp=datetime.utcnow().isoformat(),
+        status="rendering"
+    )
+    render_jobs.put(request.artifact_id, response)
+    background_tasks.add_task(complete_progressive_render, request, api_url, started, response.preview_url)
+    return response
+
+async def complete_progressive_render(request: WolframRequest, api_url: str, started: float, preview_url: str):
+    """Full render for a preview request; its result replaces the job's status"""
+    try:
+        result = await render_and_store(request, api_url)
+        full_render_latency.record(request.format, time.perf_counter() - started)
+    except Exception as e:
+        result = error_response(request, e)
+    
+    result.preview_url = preview_url
+    render_jobs.put(request.artifact_id, result)
+
+async def render_ephemeral(request: WolframRequest, api_url: str, started: float) -> Response:
+    """
+    Render and return the image bytes directly; the bytes are only kept in memory for promotion
+    """
+    content, render_ms = await render(request, api_url)
+    elapsed = time.perf_counter() - started
+    first_image_latency.record(request.format, elapsed)
+    full_render_latency.record(request.format, elapsed)
+    
+    ephemeral_renders.put(request.artifact_id, (request.expression, request.format, content, render_ms))
+    logger.info(f"Returning ephemeral render for artifact {request.artifact_id} ({len(content)} bytes)")
+    
+    return Response(
+        content=content,
+        media_type=CONTENT_TYPES[request.format],
+        headers={
+            "Cache-Control": "no-store",
+            "X-Artifact-Id": request.artifact_id,
+            "X-Content-SHA256": hashlib.sha256(content).hexdigest(),
+            "X-Render-Ms": f"{render_ms:.1f}"
+        }
+    )
+
+@app.post("/artifacts/{artifact_id}/promote", response_model=WolframResponse)
+async def promote_artifact(artifact_id: str):
+    """
+    Store a recent ephemeral render as a regular artifact without re-rendering it
+    """
+    cached = ephemeral_renders.get(artifact_id)
+    if cached is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No ephemeral render cached for artifact: {artifact_id}; it may have expired"
+        )
+    
+    expression, format, content, render_ms = cached
+    request = WolframRequest(expression=expression, format=format, artifact_id=artifact_id)
+    try:
+        logger.info(f"Promoting ephemeral render for artifact {artifact_id}")
+        result = await run_in_threadpool(store_render, request, content, render_ms)
+    except Exception as e:
+        # Keep the bytes so a retry doesn't need a re-render
+        return error_response(request, e)
+    
+    ephemeral_renders.pop(artifact_id)
+    return result
+
+def error_response(request: WolframRequest, error: Exception) -> WolframResponse:
+    """Log a failed render and describe it as an unsuccessful WolframResponse"""
+    if isinstance(error, QuotaTimeoutError):
+        logger.warning(f"Wolfram quota exceeded: {str(error)}")
+        message = f"Wolfram quota exceeded: {str(error)}"
+    elif isinstance(error, requests.RequestException):
+        logger.error(f"Wolfram API error: {str(error)}")
+        message = f"Wolfram API error: {str(error)}"
+    else:
+        logger.error(f"Unexpected error: {str(error)}")
+        message = f"Service error: {str(error)}"
+    
+    return WolframResponse(
+        success=False,
+        artifact_id=request.artifact_id,
+        expression=request.expression,
+        format=request.format,
+        timestamp=datetime.utcnow().isoformat(),
+        error=message,
+        status="failed"
+    )
 
 @app.post("/generate", response_model=WolframResponse)
-async def generate_artifact(request: WolframRequest):
+async def generate_artifact(request: WolframRequest, background_tasks: BackgroundTasks):
     """
     Generate artifact using Wolfram API and store in Google Cloud Storage
     """
+    started = time.perf_counter()
     try:
         logger.info(f"Processing request for artifact {request.artifact_id}")
+        span = trace.get_current_span()
+        span.set_attribute("artifact.id", request.artifact_id)
+        span.set_attribute("artifact.format", request.format)
+        span.set_attribute("wolfram.priority", request.priority)
         
         # Validate format
         if request.format not in ["png", "gif"]:
@@ -60,65 +618,68 @@ async def generate_artifact(request: WolframRequest):
         if not api_url:
             raise HTTPException(status_code=400, detail=f"API not found for format: {request.format}")
         
-        # Call Wolfram API
-        logger.info(f"Calling Wolfram API: {api_url}")
-        wolfram_params = {"expr": request.expression}
-        
-        response = requests.get(api_url, params=wolfram_params, timeout=30)
-        response.raise_for_status()
+        # Validate priority class
+        if request.priority not in PRIORITIES:
+            raise HTTPException(status_code=400, detail="Priority must be 'interactive' or 'batch'")
         
-        # Generate unique filename
-        timestamp = datetime.utcnow().isoformat()
-        filename = f"artifacts/{request.artifact_id}_{uuid.uuid4().hex[:8]}.{request.format}"
+        # Ephemeral mode: stream the bytes back, no storage writes
+        if request.ephemeral:
+            span.set_attribute("render.ephemeral", True)
+            return await render_ephemeral(request, api_url, started)
         
-        # Upload to Google Cloud Storage
-        logger.info(f"Uploading to GCS: {filename}")
-        bucket = storage_client.bucket(BUCKET_NAME)
-        blob = bucket.blob(filename)
+        # Reuse a stored render of the same expression and format instead of calling Wolfram
+        cached = lookup_render(request.expression, request.format) if RENDER_CACHE_ENABLED else None
+        span.set_attribute("render_cache.hit", cached is not None)
+        if cached is not None:
+            # The id may already hold this render (e.g. a re-run of warm_cache.py); keep its entry as is
+            own = artifact_index.get(request.artifact_id)
+            if own is not None and (own["expression_hash"], own["format"]) == (cached["expression_hash"], cached["format"]):
+                cached = own
+                timestamp = own["created_at"]
+            else:
+                timestamp = datetime.utcnow().isoformat()
+                await run_in_threadpool(write_alias, request.artifact_id, request.expression, cached)
+                await run_in_threadpool(
+                    artifact_index.record,
+                    artifact_id=request.artifact_id,
+                    gcs_path=cached["gcs_path"],
+                    expression=request.expression,
+                    format=request.format,
+                    size_bytes=cached["size_bytes"],
+                    render_ms=None,
+                    content_sha256=cached["content_sha256"],
+                    created_at=timestamp
+                )
+            artifact_locations.put(request.artifact_id, (cached["gcs_path"], cached["content_sha256"]))
+            image_url = public_url(cached["gcs_path"])
+            logger.info(f"Render cache hit for artifact {request.artifact_id}: {image_url}")
+            
+            return WolframResponse(
+                success=True,
+                artifact_id=request.artifact_id,
+                expression=request.expression,
+                format=request.format,
+                image_url=image_url,
+                gcs_path=cached["gcs_path"],
+                timestamp=timestamp,
+                cached=True
+            )
         
-        # Set content type based on format
-        content_type = "image/png" if request.format == "png" else "image/gif"
-        blob.upload_from_string(response.content, content_type=content_type)
+        # Progressive mode: return a fast preview now, deliver the full render via polling
+        if request.preview and WOLFRAM_APIS.get("png"):
+            span.set_attribute("render.preview", True)
+            result = await start_progressive_render(request, api_url, started, background_tasks)
+            if result is not None:
+                return result
         
-        # Make blob publicly readable
-        blob.make_public()
+        result = await render_and_store(request, api_url)
+        elapsed = time.perf_counter() - started
+        first_image_latency.record(request.format, elapsed)
+        full_render_latency.record(request.format, elapsed)
+        return result
         
-        # Generate public URL
-        public_url = f"https://storage.googleapis.com/{BUCKET_NAME}/{filename}"
-        
-        logger.info(f"Successfully generated artifact: {public_url}")
-        
-        return WolframResponse(
-            success=True,
-            artifact_id=request.artifact_id,
-            expression=request.expression,
-            format=request.format,
-            image_url=public_url,
-            gcs_path=filename,
-            timestamp=timestamp
-        )
-        
-    except requests.RequestException as e:
-        logger.error(f"Wolfram API error: {str(e)}")
-        return WolframResponse(
-            success=False,
-            artifact_id=request.artifact_id,
-            expression=request.expression,
-            format=request.format,
-            timestamp=datetime.utcnow().isoformat(),
-            error=f"Wolfram API error: {str(e)}"
-        )
-    
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
-        return WolframResponse(
-            success=False,
-            artifact_id=request.artifact_id,
-            expression=request.expression,
-            format=request.format,
-            timestamp=datetime.utcnow().isoformat(),
-            error=f"Service error: {str(e)}"
-        )
+        return error_response(request, e)
 
 if __name__ == "__main__":
     import uvicorn
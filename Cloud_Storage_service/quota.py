@@ -0,0 +1,192 @@
+"""
+Token-bucket quota management for outbound Wolfram API calls.
+
+Each Wolfram endpoint gets its own bucket shared by every priority class.
+Batch callers only take a token once no interactive caller is queued on the
+same endpoint, so background work always drains behind interactive traffic.
+
+Buckets live in process memory, so limits apply per instance; a deployment of
+N instances sends up to N times the configured rate to Wolfram.
+"""
+
+import asyncio
+import time
+from typing import Dict, Iterable, Optional
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH)
+
+
+class QuotaTimeoutError(Exception):
+    """Raised when a caller waits longer than its priority class allows."""
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `rate` tokens per second.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_take(self) -> bool:
+        """Take one token if available, without waiting."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def time_until_token(self) -> float:
+        """Seconds until at least one token is available."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class _ClassStats:
+    """Quota use and queue wait counters for one priority class."""
+
+    def __init__(self):
+        self.granted = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.granted_by_endpoint: Dict[str, int] = {}
+
+    def record(self, endpoint: str, waited: float):
+        self.granted += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.granted_by_endpoint[endpoint] = self.granted_by_endpoint.get(endpoint, 0) + 1
+
+    def as_dict(self) -> Dict:
+        return {
+            "granted": self.granted,
+            "timed_out": self.timed_out,
+            "granted_by_endpoint": dict(self.granted_by_endpoint),
+            "avg_wait_seconds": round(self.total_wait / self.granted, 4) if self.granted else 0.0,
+            "max_wait_seconds": round(self.max_wait, 4),
+            "total_wait_seconds": round(self.total_wait, 4),
+        }
+
+
+class QuotaManager:
+    """
+    Rate limiter for Wolfram endpoints with interactive and batch priority classes.
+    """
+
+    def __init__(
+        self,
+        endpoints: Iterable[str],
+        rate: float,
+        capacity: float,
+        timeouts: Optional[Dict[str, Optional[float]]] = None,
+        poll_interval: float = 0.05
+    ):
+        """
+        Initialize the QuotaManager.
+
+        Args:
+            endpoints: Names of the Wolfram endpoints to limit (e.g. "png", "gif")
+            rate: Tokens added per second to each endpoint's bucket
+            capacity: Maximum burst size per endpoint
+            timeouts: Maximum queue wait in seconds per priority class (None waits forever)
+            poll_interval: How often queued batch callers re-check for interactive waiters
+        """
+        self.buckets = {endpoint: TokenBucket(rate, capacity) for endpoint in endpoints}
+        self.timeouts = timeouts or {}
+        self.poll_interval = poll_interval
+        self.queued = {endpoint: {priority: 0 for priority in PRIORITIES} for endpoint in self.buckets}
+        self.stats = {priority: _ClassStats() for priority in PRIORITIES}
+
+    async def acquire(self, endpoint: str, priority: str = PRIORITY_INTERACTIVE) -> float:
+        """
+        Wait for a token on the given endpoint.
+
+        Args:
+            endpoint: Wolfram endpoint name
+            priority: "interactive" or "batch"
+
+        Returns:
+            float: Seconds spent waiting in the queue
+
+        Raises:
+            QuotaTimeoutError: If the wait exceeds the priority class timeout
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        bucket = self.buckets[endpoint]
+        queued = self.queued[endpoint]
+        timeout = self.timeouts.get(priority)
+        started = time.monotonic()
+
+        queued[priority] += 1
+        try:
+            while True:
+                # Batch work yields to any interactive caller queued on this endpoint
+                blocked = priority == PRIORITY_BATCH and queued[PRIORITY_INTERACTIVE] > 0
+                if not blocked and bucket.try_take():
+                    break
+
+                waited = time.monotonic() - started
+                if timeout is not None and waited >= timeout:
+                    self.stats[priority].timed_out += 1
+                    raise QuotaTimeoutError(
+                        f"No {endpoint} quota available for {priority} request after {waited:.1f}s"
+                    )
+
+                delay = self.poll_interval if blocked else bucket.time_until_token()
+                if timeout is not None:
+                    delay = min(delay, timeout - waited)
+                await asyncio.sleep(max(delay, 0.001))
+        finally:
+            queued[priority] -= 1
+
+        waited = time.monotonic() - started
+        self.stats[priority].record(endpoint, waited)
+        return waited
+
+    def try_acquire(self, endpoint: str, priority: str = PRIORITY_INTERACTIVE) -> bool:
+        """
+        Take a token only if one is available right now, e.g. for an optional hedge request.
+
+        Returns:
+            bool: True if a token was taken
+        """
+        if priority == PRIORITY_BATCH and self.queued[endpoint][PRIORITY_INTERACTIVE] > 0:
+            return False
+        if not self.buckets[endpoint].try_take():
+            return False
+        self.stats[priority].record(endpoint, 0.0)
+        return True
+
+    def snapshot(self) -> Dict:
+        """Current bucket state and per-class quota metrics."""
+        endpoints = {}
+        for endpoint, bucket in self.buckets.items():
+            bucket.time_until_token()  # refill before reporting
+            endpoints[endpoint] = {
+                "tokens_available": round(bucket.tokens, 2),
+                "rate_per_second": bucket.rate,
+                "capacity": bucket.capacity,
+                "queued": dict(self.queued[endpoint]),
+            }
+
+        return {
+            "endpoints": endpoints,
+            "classes": {priority: stats.as_dict() for priority, stats in self.stats.items()},
+        }
@@ -0,0 +1,55 @@
+"""
+OpenTelemetry tracing setup for the Wolfram Cloud Storage Service.
+
+Incoming requests continue the W3C `traceparent` context sent by the
+Artifact Agent tool, so render and upload spans join the caller's trace.
+"""
+
+import os
+import logging
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+logger = logging.getLogger(__name__)
+
+
+def setup_tracing(service_name: str) -> TracerProvider:
+    """
+    Install a tracer provider that exports spans to a local file and/or a collector.
+
+    Spans are written as JSON lines to `TRACE_EXPORT_FILE` when set, and sent over
+    OTLP/HTTP when `OTEL_EXPORTER_OTLP_ENDPOINT` is set. With neither set, trace
+    context is still created and propagated but nothing is exported.
+
+    Args:
+        service_name: Value for the `service.name` resource attribute
+
+    Returns:
+        TracerProvider: The installed provider
+    """
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+
+    trace_file = os.getenv("TRACE_EXPORT_FILE")
+    if trace_file:
+        exporter = ConsoleSpanExporter(
+            out=open(trace_file, "a"),
+            formatter=lambda span: span.to_json(indent=None) + "\n"
+        )
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+        logger.info(f"Exporting spans to file: {trace_file}")
+
+    if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        logger.info(f"Exporting spans to collector: {os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT')}")
+
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+def format_trace_id(span: trace.Span) -> str:
+    """Hex trace id of a span, as shown by trace viewers."""
+    return format(span.get_span_context().trace_id, "032x")
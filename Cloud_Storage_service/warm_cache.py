@@ -0,0 +1,156 @@
+"""
+Cache-warming job: render popular and example expressions ahead of users.
+
+Expressions come from the examples in the Artifact Agent instruction, from a
+file, and/or from the most requested expressions recorded by a running
+service. Each one is sent through the service's normal `/generate` pipeline as
+batch traffic, so it fills the render cache and artifact index without taking
+Wolfram quota away from interactive users.
+
+Usage:
+    python warm_cache.py --service-url http://localhost:8080 \\
+        --from-instruction ../Artifact_Agent/artifact_agent/config.py \\
+        --file expressions.txt --from-popular 50 --concurrency 4
+"""
+
+import argparse
+import hashlib
+import logging
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import requests
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger("warm_cache")
+
+# Example lines in WOLFRAM_INSTRUCTION look like: - "Create a sine wave plot" → `Plot[Sin[x], {x, 0, 2*Pi}]`
+INSTRUCTION_EXAMPLE = re.compile(r"→\s*`([^`]+)`")
+
+ANIMATION_HEADS = ("Animate[", "ListAnimate[")
+
+
+def infer_format(expression: str) -> str:
+    """Animations render as GIF, everything else as PNG, matching the agent's instruction."""
+    return "gif" if expression.lstrip().startswith(ANIMATION_HEADS) else "png"
+
+
+def expressions_from_instruction(config_path: str) -> List[Tuple[str, str]]:
+    """Example expressions baked into the Artifact Agent's WOLFRAM_INSTRUCTION."""
+    with open(config_path, encoding="utf-8") as f:
+        text = f.read()
+    return [(expr, infer_format(expr)) for expr in INSTRUCTION_EXAMPLE.findall(text)]
+
+
+def expressions_from_file(path: str) -> List[Tuple[str, str]]:
+    """One expression per line; blank lines and lines starting with # are skipped."""
+    expressions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            expr = line.strip()
+            if expr and not expr.startswith("#"):
+                expressions.append((expr, infer_format(expr)))
+    return expressions
+
+
+def expressions_from_service(service_url: str, limit: int, days: float) -> List[Tuple[str, str]]:
+    """Most requested expressions according to the service's artifact index."""
+    params = {"limit": limit}
+    if days:
+        params["days"] = days
+    response = requests.get(f"{service_url}/expressions/popular", params=params, timeout=30)
+    response.raise_for_status()
+    return [(item["expression"], item["format"]) for item in response.json()["items"]]
+
+
+def warm_one(service_url: str, expression: str, format: str) -> Dict:
+    """Render one expression through /generate as batch traffic."""
+    # Stable id per expression, so re-running the job doesn't pile up index entries
+    digest = hashlib.sha256(f"{format}:{expression}".encode("utf-8")).hexdigest()[:16]
+    payload = {
+        "expression": expression,
+        "format": format,
+        "artifact_id": f"warm_{digest}",
+        "priority": "batch"
+    }
+
+    started = time.perf_counter()
+    try:
+        response = requests.post(f"{service_url}/generate", json=payload, timeout=900)
+        response.raise_for_status()
+        result = response.json()
+    except requests.RequestException as e:
+        result = {"success": False, "error": str(e)}
+    result["elapsed_s"] = round(time.perf_counter() - started, 2)
+    result.setdefault("expression", expression)
+    return result
+
+
+def run(service_url: str, expressions: List[Tuple[str, str]], concurrency: int) -> Dict:
+    """
+    Warm every expression with at most `concurrency` renders in flight.
+
+    Returns:
+        dict: Counts of rendered, already cached and failed expressions
+    """
+    summary = {"total": len(expressions), "rendered": 0, "cached": 0, "failed": 0}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(warm_one, service_url, expr, fmt) for expr, fmt in expressions]
+        for future in futures:
+            result = future.result()
+            if not result.get("success"):
+                summary["failed"] += 1
+                logger.error(f"Failed ({result['elapsed_s']}s): {result['expression']}: {result.get('error')}")
+            elif result.get("cached"):
+                summary["cached"] += 1
+                logger.info(f"Already cached ({result['elapsed_s']}s): {result['expression']}")
+            else:
+                summary["rendered"] += 1
+                logger.info(f"Rendered ({result['elapsed_s']}s): {result['expression']}")
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm the render cache with popular and example expressions")
+    parser.add_argument("--service-url", required=True, help="Base URL of the Wolfram Cloud Storage Service")
+    parser.add_argument("--from-instruction", metavar="CONFIG_PY",
+                        help="Artifact Agent config.py whose WOLFRAM_INSTRUCTION examples to warm")
+    parser.add_argument("--file", help="File with one expression per line")
+    parser.add_argument("--from-popular", type=int, default=0, metavar="N",
+                        help="Warm the N most requested expressions recorded by the service")
+    parser.add_argument("--days", type=float, default=7, help="Look-back window for --from-popular (default: 7)")
+    parser.add_argument("--concurrency", type=int, default=2, help="Renders in flight at once (default: 2)")
+    args = parser.parse_args()
+
+    service_url = args.service_url.rstrip("/")
+    expressions: List[Tuple[str, str]] = []
+    if args.from_instruction:
+        expressions += expressions_from_instruction(args.from_instruction)
+    if args.file:
+        expressions += expressions_from_file(args.file)
+    if args.from_popular:
+        expressions += expressions_from_service(service_url, args.from_popular, args.days)
+
+    # Keep the first occurrence of each (expression, format)
+    expressions = list(dict.fromkeys(expressions))
+    if not expressions:
+        parser.error("No expressions to warm; use --from-instruction, --file and/or --from-popular")
+
+    logger.info(f"Warming {len(expressions)} expressions with concurrency {args.concurrency}")
+    started = time.perf_counter()
+    summary = run(service_url, expressions, args.concurrency)
+    logger.info(
+        f"Done in {time.perf_counter() - started:.1f}s: {summary['rendered']} rendered, "
+        f"{summary['cached']} already cached, {summary['failed']} failed"
+    )
+
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()